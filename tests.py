@@ -4,6 +4,7 @@ import tempfile
 import shutil
 import threading
 import time
+import fractions
 import importlib.util
 spec = importlib.util.spec_from_file_location("vaults_module", "vaults.py")
 vaults = importlib.util.module_from_spec(spec)
@@ -34,12 +35,46 @@ class TestVaultCore(unittest.TestCase):
         self.assertEqual(popped_value, 'value2')
         self.assertIsNone(self.vault.get('key2'))
 
+    def test_pop_keeps_undecodable_row(self):
+        self.vault._execute("INSERT INTO dict (key, value) VALUES (?, ?)", (vaults._serialize('obj'), b'Pcorrupt'))
+        for has_returning in (True, False):
+            original = vaults._HAS_RETURNING
+            vaults._HAS_RETURNING = has_returning and original
+            try:
+                with self.assertRaises(Exception):
+                    self.vault.pop('obj')
+            finally:
+                vaults._HAS_RETURNING = original
+            self.assertIn('obj', self.vault)
+            self.assertEqual(len(self.vault), 1)
+
+    def test_popitem_keeps_undecodable_row(self):
+        self.vault._execute("INSERT INTO dict (key, value) VALUES (?, ?)", (vaults._serialize('obj'), b'Pcorrupt'))
+        for has_returning in (True, False):
+            original = vaults._HAS_RETURNING
+            vaults._HAS_RETURNING = has_returning and original
+            try:
+                with self.assertRaises(Exception):
+                    self.vault.popitem()
+            finally:
+                vaults._HAS_RETURNING = original
+            self.assertIn('obj', self.vault)
+
+    @unittest.skipIf(vaults._IN_MEMORY, "in-memory vaults have no file")
     def test_delete_vault(self):
         db_path = self.vault.db_path
         self.assertTrue(os.path.exists(db_path))
         self.vault.delete_vault()
         self.assertFalse(os.path.exists(db_path))
 
+    @unittest.skipIf(vaults._IN_MEMORY, "in-memory vaults have no folder")
+    def test_vaults_folder_recreated(self):
+        shutil.rmtree(vaults.vaults_folder)
+        v = Vault('recreated')
+        v['a'] = 1
+        self.assertEqual(v['a'], 1)
+        v.close()
+
     def test_non_existent_key(self):
         result = self.vault.get('nonexistent_key')
         self.assertIsNone(result)
@@ -77,6 +112,15 @@ class TestVaultCore(unittest.TestCase):
         self.vault.clear()
         self.assertEqual(len(self.vault), 0)
 
+    def test_clear_keeps_count_tracking(self):
+        self.vault.put_many({'a': 1, 'b': 2})
+        self.vault.clear()
+        self.assertEqual(len(self.vault), 0)
+        self.assertEqual(self.vault.list_keys(), [])
+        self.vault.put_many({'c': 3, 'd': 4})
+        self.vault.pop('c')
+        self.assertEqual(len(self.vault), 1)
+
     def test_popitem(self):
         self.vault.put('a', 1)
         self.vault.put('b', 2)
@@ -89,10 +133,81 @@ class TestVaultCore(unittest.TestCase):
         else:
             self.assertEqual(value, 2)
 
+    def test_pop_without_returning(self):
+        self.vault.put_many({'a': 1, 'b': 2, 'c': 3})
+        original = vaults._HAS_RETURNING
+        vaults._HAS_RETURNING = False
+        try:
+            self.assertEqual(self.vault.pop('a'), 1)
+            self.assertEqual(self.vault.pop_many(['b']), {'b': 2})
+            self.assertEqual(self.vault.popitem(), ('c', 3))
+        finally:
+            vaults._HAS_RETURNING = original
+        self.assertEqual(len(self.vault), 0)
+
     def test_popitem_empty(self):
         with self.assertRaises(VaultError):
             self.vault.popitem()
 
+    def test_table_without_rowid(self):
+        cursor = self.vault._execute("SELECT sql FROM sqlite_master WHERE name = 'dict'")
+        self.assertIn('WITHOUT ROWID', cursor.fetchone()[0])
+
+    @unittest.skipIf(vaults._IN_MEMORY, "legacy vaults are files")
+    def test_legacy_rowid_table_migrated(self):
+        db_path = os.path.join(vaults.vaults_folder, 'legacy_rowid.db')
+        connection = vaults.sqlite3.connect(db_path)
+        connection.execute("CREATE TABLE dict (key BLOB PRIMARY KEY, value BLOB)")
+        connection.executemany(
+            "INSERT INTO dict (key, value) VALUES (?, ?)",
+            [(vaults._serialize(k), vaults._serialize(v)) for k, v in {'a': 1, 'b': [2, 3]}.items()]
+        )
+        connection.commit()
+        connection.close()
+
+        legacy = Vault('legacy_rowid', to_create=False)
+        cursor = legacy._execute("SELECT sql FROM sqlite_master WHERE name = 'dict'")
+        self.assertIn('WITHOUT ROWID', cursor.fetchone()[0])
+        self.assertEqual(legacy.get_all_items(), [('a', 1), ('b', [2, 3])])
+        self.assertEqual(len(legacy), 2)
+        legacy['c'] = 4
+        self.assertEqual(len(legacy), 3)
+        legacy.close()
+
+    @unittest.skipIf(vaults._IN_MEMORY, "in-memory vaults have no journal file")
+    def test_wal_journal_mode(self):
+        cursor = self.vault._execute("PRAGMA journal_mode")
+        self.assertEqual(cursor.fetchone()[0], 'wal')
+
+    @unittest.skipIf(vaults._IN_MEMORY, "in-memory vaults have no journal file")
+    def test_checkpoint_blocked_by_reader(self):
+        self.vault.put_many({f'key{i}': i for i in range(100)})
+        reader = vaults.sqlite3.connect(self.vault.db_path, isolation_level=None)
+        reader.execute("BEGIN")
+        reader.execute("SELECT COUNT(*) FROM dict").fetchone()
+        self.vault['late'] = 1
+        self.vault._connection.execute("PRAGMA busy_timeout=0")
+        try:
+            self.assertFalse(self.vault.checkpoint())
+        finally:
+            reader.execute("COMMIT")
+            reader.close()
+        self.assertTrue(self.vault.checkpoint())
+
+    @unittest.skipIf(vaults._IN_MEMORY, "in-memory vaults skip the connection PRAGMAs")
+    def test_new_vault_page_size(self):
+        cursor = self.vault._execute("PRAGMA page_size")
+        self.assertEqual(cursor.fetchone()[0], 8192)
+
+    @unittest.skipIf(vaults._IN_MEMORY, "in-memory vaults have no journal file")
+    def test_checkpoint_truncates_wal(self):
+        self.vault.put_many({f'key{i}': 'x' * 100 for i in range(200)})
+        wal_path = self.vault.db_path + '-wal'
+        self.assertGreater(os.path.getsize(wal_path), 0)
+        self.assertTrue(self.vault.checkpoint())
+        self.assertEqual(os.path.getsize(wal_path), 0)
+        self.assertEqual(self.vault.get('key199'), 'x' * 100)
+
 
 class TestVaultDictProtocol(unittest.TestCase):
     def setUp(self):
@@ -130,6 +245,13 @@ class TestVaultDictProtocol(unittest.TestCase):
         with self.assertRaises(KeyError):
             del self.vault['missing']
 
+    def test_delete(self):
+        self.vault['key'] = 'value'
+        self.assertTrue(self.vault.delete('key'))
+        self.assertNotIn('key', self.vault)
+        self.assertFalse(self.vault.delete('key'))
+        self.assertEqual(len(self.vault), 0)
+
     def test_contains(self):
         self.vault['key'] = 'value'
         self.assertIn('key', self.vault)
@@ -141,6 +263,50 @@ class TestVaultDictProtocol(unittest.TestCase):
         self.vault['b'] = 2
         self.assertEqual(len(self.vault), 2)
 
+    def test_len_tracks_overwrites_and_deletes(self):
+        self.vault['a'] = 1
+        self.vault['a'] = 2
+        self.vault.put_many({'a': 3, 'b': 4, 'c': 5})
+        self.assertEqual(len(self.vault), 3)
+        self.vault.pop('a')
+        del self.vault['b']
+        self.vault.popitem()
+        self.assertEqual(len(self.vault), 0)
+        self.vault.update({'x': 1, 'y': 2})
+        self.vault.clear()
+        self.assertEqual(len(self.vault), 0)
+
+    def test_len_seen_by_other_instance(self):
+        other = Vault('dict_test', to_create=False)
+        self.vault.put_many({'a': 1, 'b': 2})
+        self.assertEqual(len(other), 2)
+        other.pop('a')
+        self.assertEqual(len(self.vault), 1)
+
+    def test_reused_cursor_sees_other_writers(self):
+        other = Vault('dict_test', to_create=False)
+        self.vault['a'] = 1
+        self.assertEqual(other['a'], 1)
+        self.assertIn('a', other)
+        self.vault['a'] = 2
+        self.vault['b'] = 3
+        self.assertEqual(other['a'], 2)
+        self.assertIn('b', other)
+        self.assertEqual(len(other), 2)
+        other.close()
+
+    def test_len_backfilled_for_legacy_vault(self):
+        db_path = self.vault.db_path
+        self.vault.put_many({'a': 1, 'b': 2})
+        self.vault._execute("DROP TRIGGER dict_count_insert")
+        self.vault._execute("DROP TRIGGER dict_count_delete")
+        self.vault._execute("DROP TABLE meta")
+        self.vault['c'] = 3
+        self.vault.close()
+        reopened = Vault('dict_test', to_create=False)
+        self.assertEqual(reopened.db_path, db_path)
+        self.assertEqual(len(reopened), 3)
+
     def test_iter(self):
         self.vault['a'] = 1
         self.vault['b'] = 2
@@ -148,6 +314,15 @@ class TestVaultDictProtocol(unittest.TestCase):
         keys = list(self.vault)
         self.assertCountEqual(keys, ['a', 'b', 'c'])
 
+    def test_iter_allows_writes_in_loop(self):
+        self.vault.put_many({f'k{i}': i for i in range(3000)})
+        seen = 0
+        for key in self.vault:
+            self.vault[key + '_c'] = 0
+            seen += 1
+        self.assertEqual(seen, 3000)
+        self.assertEqual(len(self.vault), 6000)
+
     def test_bool(self):
         self.assertFalse(bool(self.vault))
         self.vault['key'] = 'value'
@@ -178,6 +353,23 @@ class TestVaultDictProtocol(unittest.TestCase):
         items_dict = dict(items)
         self.assertEqual(items_dict, {'a': 1, 'b': 2})
 
+    def test_iter_items(self):
+        data = {f'key_{i}': i for i in range(2500)}
+        self.vault.put_many(data)
+        items = self.vault.iter_items()
+        self.assertNotIsInstance(items, list)
+        self.assertEqual(dict(items), data)
+
+    def test_iter_keys(self):
+        self.vault.put_many({f'key_{i}': i for i in range(1500)})
+        keys = self.vault.iter_keys()
+        self.assertNotIsInstance(keys, list)
+        self.assertCountEqual(keys, [f'key_{i}' for i in range(1500)])
+
+    def test_iter_values(self):
+        self.vault.put_many({'a': 1, 'b': 2})
+        self.assertCountEqual(self.vault.iter_values(), [1, 2])
+
     def test_update(self):
         self.vault.update({'a': 1, 'b': 2})
         self.assertEqual(self.vault['a'], 1)
@@ -227,6 +419,19 @@ class TestVaultSerialization(unittest.TestCase):
         result = self.vault.get('tuple_key')
         self.assertEqual(result, [1, 2, 3])
 
+    def test_equal_keys_of_different_types(self):
+        self.vault[1] = 'int'
+        self.vault[True] = 'bool'
+        self.vault[1.0] = 'float'
+        self.assertEqual(self.vault[1], 'int')
+        self.assertEqual(self.vault[True], 'bool')
+        self.assertEqual(self.vault[1.0], 'float')
+        self.assertEqual(len(self.vault), 3)
+
+    def test_pickled_tuple_returned_as_list(self):
+        self.vault.put('pickled_tuple', (fractions.Fraction(1, 3), 2))
+        self.assertEqual(self.vault.get('pickled_tuple'), [fractions.Fraction(1, 3), 2])
+
     def test_none_value(self):
         self.vault.put('none_key', None)
         self.assertIsNone(self.vault.get('none_key'))
@@ -250,6 +455,93 @@ class TestVaultSerialization(unittest.TestCase):
         self.vault.put('large', large_value)
         self.assertEqual(self.vault.get('large'), large_value)
 
+    def test_pickle_fallback_types(self):
+        self.vault.put('set_key', {1, 2, 3})
+        self.vault.put('complex_key', 1 + 2j)
+        self.assertEqual(self.vault.get('set_key'), {1, 2, 3})
+        self.assertEqual(self.vault.get('complex_key'), 1 + 2j)
+
+    def test_raw_str_and_bytes_values(self):
+        self.vault.put('s', 'текст')
+        self.vault.put('e', '')
+        self.vault.put_many({'b': b'\x00\xffraw', 'eb': b''})
+        self.assertEqual(self.vault.get('s'), 'текст')
+        self.assertEqual(self.vault.get('e'), '')
+        self.assertEqual(self.vault.get('b'), b'\x00\xffraw')
+        self.assertEqual(self.vault.get('eb'), b'')
+        self.assertEqual(vaults._serialize_value('x'), b'Sx')
+        self.assertEqual(vaults._serialize_value(b'x'), b'Bx')
+
+    def test_str_keys_keep_stable_encoding(self):
+        self.vault.put('key', 'value')
+        self.assertEqual(self.vault.list_keys(), ['key'])
+        self.assertEqual(vaults._serialize('key')[0:1], b'M' if vaults.MSGPACK_AVAILABLE else b'P')
+
+    def test_big_int_values(self):
+        self.vault.put('big', 2 ** 70)
+        self.vault.put_many({'neg': -2 ** 70, 'ok': 1})
+        self.assertEqual(self.vault.get('big'), 2 ** 70)
+        self.assertEqual(self.vault.get('neg'), -2 ** 70)
+        self.assertEqual(self.vault.get('ok'), 1)
+
+    def test_dict_with_int_keys(self):
+        self.vault.put('int_keys', {1: 'a', 2: 'b'})
+        self.assertEqual(self.vault.get('int_keys'), {1: 'a', 2: 'b'})
+
+    def test_msgpack_fallback_decoder(self):
+        data = vaults._serialize({'a': [1, 2], 3: None})
+        original = vaults._msgspec_decoder
+        vaults._msgspec_decoder = None
+        try:
+            self.assertEqual(vaults._deserialize(data), {'a': [1, 2], 3: None})
+        finally:
+            vaults._msgspec_decoder = original
+
+    def test_msgpack_decoders_agree(self):
+        try:
+            import msgspec
+        except ImportError:
+            self.skipTest("msgspec is not installed")
+        payloads = [
+            {'a': [1, 2], 3: None},
+            {(1, 2): 'a'},
+            {(1, (2, 3)): [1, (2, 3)], 'nested': {(4,): {5: 6}}},
+            {1.5: 'f', None: 'n', True: 't', b'x': [b'y']},
+            [1, 'two', 3.0, None, {'k': (1, 2)}],
+        ]
+        original = vaults._msgspec_decoder
+        try:
+            for payload in payloads:
+                data = vaults._serialize(payload)
+                vaults._msgspec_decoder = msgspec.msgpack.Decoder()
+                with_msgspec = vaults._deserialize(data)
+                vaults._msgspec_decoder = None
+                self.assertEqual(vaults._deserialize(data), with_msgspec)
+        finally:
+            vaults._msgspec_decoder = original
+
+    def test_tuple_dict_keys_without_msgspec(self):
+        original = vaults._msgspec_decoder
+        vaults._msgspec_decoder = None
+        try:
+            self.vault.put('tuple_keys', {(1, 2): 'a', (3, (4, 5)): 'b'})
+            self.assertEqual(self.vault.get('tuple_keys'), {(1, 2): 'a', (3, (4, 5)): 'b'})
+        finally:
+            vaults._msgspec_decoder = original
+
+    def test_large_values_are_compressed(self):
+        value = {'rows': [{'name': 'item', 'count': i % 7} for i in range(500)]}
+        self.assertEqual(vaults._serialize_value(value)[0:1], b'Z')
+        self.assertEqual(vaults._serialize_value('x' * 100000)[0:1], b'Z')
+        self.vault.put('large_dict', value)
+        self.assertEqual(self.vault.get('large_dict'), value)
+
+    def test_incompressible_values_stored_raw(self):
+        value = os.urandom(4096)
+        self.assertEqual(vaults._serialize_value(value)[0:1], b'B')
+        self.vault.put('random', value)
+        self.assertEqual(self.vault.get('random'), value)
+
     def test_special_characters(self):
         special = '!@#$%^&*()_+-=[]{}|;\':",./<>?'
         self.vault.put('special', special)
@@ -272,6 +564,17 @@ class TestVaultContextManager(unittest.TestCase):
         self.assertEqual(v2['key'], 'value')
         v2.delete_vault()
 
+    def test_context_manager_closes_connection(self):
+        with Vault('context_close_test') as v:
+            v['key'] = 'value'
+        with self.assertRaises(VaultError):
+            v.get('key')
+
+    def test_close_is_idempotent(self):
+        v = Vault('close_test')
+        v.close()
+        v.close()
+
 
 class TestVaultThreadSafety(unittest.TestCase):
     def setUp(self):
@@ -287,6 +590,32 @@ class TestVaultThreadSafety(unittest.TestCase):
         self.assertTrue(v._thread_safe)
         v.delete_vault()
 
+    @unittest.skipIf(vaults._IN_MEMORY, "in-memory vaults share one connection")
+    def test_thread_local_connections(self):
+        v = Vault('thread_local_test', thread_safe=True)
+        v['a'] = 1
+        seen = []
+
+        def worker():
+            seen.append((v._connection, v['a']))
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        connections = {id(connection) for connection, _ in seen}
+        self.assertEqual(len(connections), 3)
+        self.assertNotIn(id(v._connection), connections)
+        self.assertEqual([value for _, value in seen], [1, 1, 1])
+        v.close()
+        for connection, _ in seen:
+            with self.assertRaises(vaults.sqlite3.ProgrammingError):
+                connection.execute("SELECT 1")
+        with self.assertRaises(VaultError):
+            v.get('a')
+
     def test_non_thread_safe_creation(self):
         v = Vault('thread_test', thread_safe=False)
         self.assertFalse(v._thread_safe)
@@ -316,6 +645,32 @@ class TestVaultThreadSafety(unittest.TestCase):
         self.assertEqual(len(v), 100)
         v.delete_vault()
 
+    def test_concurrent_pops_return_each_value_once(self):
+        v = Vault('concurrent_pop_test', thread_safe=True)
+        v.put_many({f'key_{i}': i for i in range(200)})
+        popped = []
+        errors = []
+
+        def worker():
+            try:
+                for i in range(200):
+                    value = v.pop(f'key_{i}')
+                    if value is not None:
+                        popped.append(value)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertCountEqual(popped, list(range(200)))
+        self.assertEqual(len(v), 0)
+        v.delete_vault()
+
 
 class TestVaultErrorHandling(unittest.TestCase):
     def setUp(self):
@@ -330,6 +685,13 @@ class TestVaultErrorHandling(unittest.TestCase):
         with self.assertRaises(VaultError):
             Vault('does_not_exist', to_create=False)
 
+    def test_deleted_vault_no_longer_exists(self):
+        v = Vault('deleted')
+        v['key'] = 'value'
+        v.delete_vault()
+        with self.assertRaises(VaultError):
+            Vault('deleted', to_create=False)
+
 
 class TestVaultEdgeCases(unittest.TestCase):
     def setUp(self):
@@ -365,6 +727,79 @@ class TestVaultEdgeCases(unittest.TestCase):
         self.assertEqual(len(v), 2)
 
 
+class TestVaultReadCache(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        set_root_path(self.test_dir)
+        self.vault = Vault('cache_test', cache_size=2)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_cache_disabled_by_default(self):
+        v = Vault('no_cache')
+        self.assertIsNone(v._cache)
+
+    def test_cache_hit(self):
+        self.vault['a'] = {'x': 1}
+        self.assertEqual(self.vault['a'], {'x': 1})
+        self.assertEqual(len(self.vault._cache), 1)
+        self.assertEqual(self.vault['a'], {'x': 1})
+
+    def test_cached_value_is_not_shared(self):
+        self.vault['a'] = {'x': 1}
+        self.vault['a']['x'] = 2
+        self.assertEqual(self.vault['a'], {'x': 1})
+
+    def test_cache_evicts_least_recently_used(self):
+        self.vault.put_many({'a': 1, 'b': 2, 'c': 3})
+        self.vault.get('a')
+        self.vault.get('b')
+        self.vault.get('a')
+        self.vault.get('c')
+        self.assertEqual(len(self.vault._cache), 2)
+        self.assertEqual(self.vault.get('b'), 2)
+
+    def test_get_many_uses_cache(self):
+        self.vault.put_many({'a': 1, 'b': 2, 'c': 3})
+        self.vault.get('a')
+        self.assertEqual(self.vault.get_many(['a', 'b', 'missing']), {'a': 1, 'b': 2})
+        self.assertEqual(set(self.vault._cache), {vaults._serialize('a'), vaults._serialize('b')})
+        self.vault['a'] = 10
+        self.assertEqual(self.vault.get_many(['a', 'b']), {'a': 10, 'b': 2})
+
+    def test_get_many_keys_independent_of_cache(self):
+        self.vault[(1, 2)] = 'x'
+        with self.assertRaises(TypeError):
+            self.vault.get_many([(1, 2)])
+        self.vault.get((1, 2))
+        with self.assertRaises(TypeError):
+            self.vault.get_many([(1, 2)])
+
+    def test_cache_invalidated_on_writes(self):
+        self.vault['a'] = 1
+        self.assertEqual(self.vault['a'], 1)
+        self.vault['a'] = 2
+        self.assertEqual(self.vault['a'], 2)
+        self.vault.put_many({'a': 3})
+        self.assertEqual(self.vault['a'], 3)
+        self.vault.pop('a')
+        self.assertIsNone(self.vault.get('a'))
+        self.vault['b'] = 1
+        self.vault.get('b')
+        del self.vault['b']
+        self.assertIsNone(self.vault.get('b'))
+        self.vault['c'] = 1
+        self.vault.get('c')
+        self.vault.pop_many(['c'])
+        self.assertIsNone(self.vault.get('c'))
+        self.vault['d'] = 1
+        self.vault.get('d')
+        self.vault.clear()
+        self.assertIsNone(self.vault.get('d'))
+
+
 class TestVaultBulkOperations(unittest.TestCase):
     def setUp(self):
         self.test_dir = tempfile.mkdtemp()
@@ -450,6 +885,14 @@ class TestVaultBulkOperations(unittest.TestCase):
         result = self.vault.get_many(['only'])
         self.assertEqual(result, {'only': 'value'})
 
+    def test_pop_many_keeps_rows_on_error(self):
+        self.vault[(1, 2)] = 'x'
+        self.vault['a'] = 1
+        with self.assertRaises(TypeError):
+            self.vault.pop_many([(1, 2), 'a'])
+        self.assertEqual(len(self.vault), 2)
+        self.assertEqual(self.vault['a'], 1)
+
     def test_pop_many_basic(self):
         self.vault['a'] = 1
         self.vault['b'] = 2
@@ -513,6 +956,11 @@ class TestVaultBulkOperations(unittest.TestCase):
         result = self.vault.has_keys(['only'])
         self.assertTrue(result)
 
+    def test_has_keys_duplicate_keys(self):
+        self.vault.put_many({'a': 1, 'b': 2})
+        self.assertTrue(self.vault.has_keys(['a', 'a', 'b']))
+        self.assertFalse(self.vault.has_keys(['a', 'c', 'c']))
+
     def test_has_keys_single_key_missing(self):
         self.vault['a'] = 'value'
         result = self.vault.has_keys(['missing'])
@@ -550,6 +998,54 @@ class TestVaultBulkOperations(unittest.TestCase):
         self.assertEqual(len(v), 100)
         v.delete_vault()
 
+    def test_bulk_operations_beyond_variable_limit(self):
+        data = {f'key_{i}': i for i in range(1200)}
+        self.assertEqual(self.vault.put_many(data), 1200)
+        self.assertEqual(self.vault.get_many(list(data)), data)
+        removed = self.vault.pop_many([f'key_{i}' for i in range(1100)])
+        self.assertEqual(len(removed), 1100)
+        self.assertEqual(len(self.vault), 100)
+
+    def test_has_keys_beyond_variable_limit(self):
+        self.vault.put_many({f'key_{i}': i for i in range(1200)})
+        self.assertTrue(self.vault.has_keys([f'key_{i}' for i in range(1200)]))
+        self.assertFalse(self.vault.has_keys([f'key_{i}' for i in range(1201)]))
+
+    def test_put_many_is_atomic(self):
+        class Unserializable:
+            def __reduce__(self):
+                raise TypeError("cannot pickle")
+
+        data = {'a': 1, 'b': Unserializable()}
+        with self.assertRaises(TypeError):
+            self.vault.put_many(data)
+        self.assertEqual(len(self.vault), 0)
+
+    def test_update_is_atomic(self):
+        class Unserializable:
+            def __reduce__(self):
+                raise TypeError("cannot pickle")
+
+        with self.assertRaises(TypeError):
+            self.vault.update({'a': 1, 'b': Unserializable()})
+        self.assertNotIn('a', self.vault)
+
+    def test_bulk_operations_with_padded_chunks(self):
+        self.vault.put_many({'a': 1, 'b': 2, 'c': 3, 'd': 4})
+        self.assertEqual(self.vault.get_many(['a', 'b', 'c']), {'a': 1, 'b': 2, 'c': 3})
+        self.assertTrue(self.vault.has_keys(['a', 'b', 'c']))
+        self.assertFalse(self.vault.has_keys(['a', 'b', 'x']))
+        self.assertEqual(self.vault.pop_many(['a', 'b', 'c']), {'a': 1, 'b': 2, 'c': 3})
+        self.assertEqual(self.vault.list_keys(), ['d'])
+
+    def test_transaction_rolls_back_on_error(self):
+        self.vault['a'] = 1
+        with self.assertRaises(VaultError):
+            with self.vault._transaction() as cursor:
+                cursor.execute("DELETE FROM dict")
+                cursor.execute("INSERT INTO missing_table VALUES (1)")
+        self.assertEqual(self.vault['a'], 1)
+
     def test_bulk_mixed_operations(self):
         self.vault.put_many({'a': 1, 'b': 2, 'c': 3})
         self.assertEqual(len(self.vault), 3)
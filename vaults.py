@@ -3,6 +3,11 @@ import pickle
 import sqlite3
 import threading
 import logging
+import urllib.parse
+import zlib
+from functools import lru_cache
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
 from logging.handlers import RotatingFileHandler
 from typing import Any, Iterator, List, Tuple, Optional, Dict
 
@@ -12,6 +17,14 @@ try:
 except ImportError:
     MSGPACK_AVAILABLE = False
 
+# msgspec decodes the same msgpack bytes faster; encoding stays on msgpack so key
+# bytes are identical whether or not msgspec is installed.
+try:
+    import msgspec
+    _msgspec_decoder = msgspec.msgpack.Decoder()
+except ImportError:
+    _msgspec_decoder = None
+
 log_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
 handler = RotatingFileHandler("vaults.log", maxBytes=10 * 1024 * 1024)
 handler.setFormatter(log_formatter)
@@ -24,6 +37,89 @@ _custom_logger = None
 root_path = os.path.dirname(os.path.abspath(__file__))
 vaults_folder = os.path.join(root_path, "vaults")
 
+# Test/CI switch: with VAULTS_IN_MEMORY=1 every vault lives in a shared-cache
+# in-memory database named after its would-be file path, so test runs skip all
+# disk I/O. An anchor connection per vault keeps the database alive across
+# close()/reopen until delete_vault() drops it.
+_IN_MEMORY = os.environ.get("VAULTS_IN_MEMORY") == "1"
+_memory_anchors: Dict[str, sqlite3.Connection] = {}
+
+_CONNECTION_PRAGMAS = (
+    # Only takes effect on a brand-new file, so it must run before journal_mode
+    # writes the header; existing vaults keep whatever page size they had.
+    "PRAGMA page_size=8192",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+    # Checkpoint every ~10k pages instead of 1k so write bursts stall less often.
+    "PRAGMA wal_autocheckpoint=10000",
+)
+
+# Hot-path statements are kept as module constants so every call hands sqlite3
+# the same SQL text and hits its per-connection prepared-statement cache.
+_SQL_CREATE_TABLE = "CREATE TABLE IF NOT EXISTS dict (key BLOB PRIMARY KEY, value BLOB) WITHOUT ROWID"
+_SQL_SELECT_VALUE = "SELECT value FROM dict WHERE key = ?"
+_SQL_UPSERT = (
+    "INSERT INTO dict (key, value) VALUES (?, ?) "
+    "ON CONFLICT(key) DO UPDATE SET value = excluded.value"
+)
+_SQL_DELETE = "DELETE FROM dict WHERE key = ?"
+_SQL_EXISTS = "SELECT EXISTS(SELECT 1 FROM dict WHERE key = ?)"
+_SQL_POP = "DELETE FROM dict WHERE key = ? RETURNING value"
+_SQL_POPITEM = "DELETE FROM dict WHERE key = (SELECT key FROM dict LIMIT 1) RETURNING key, value"
+
+# The upsert above (and the count triggers that rule out INSERT OR REPLACE)
+# need SQLite 3.24+; fail at import rather than on every write.
+if sqlite3.sqlite_version_info < (3, 24, 0):
+    raise ImportError(
+        f"vaults requires SQLite 3.24 or newer for ON CONFLICT upserts; "
+        f"this Python is linked against SQLite {sqlite3.sqlite_version}"
+    )
+
+# DELETE ... RETURNING fuses the lookup and removal of pops into one statement.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Row count bookkeeping: triggers keep meta['count'] in step with every insert
+# and delete on dict, whichever connection or process makes it, so len() is a
+# single-row read instead of a full COUNT(*) scan. Exact only for writers using
+# the upsert: INSERT OR REPLACE (vaults 2.0.0) fires just the insert trigger on
+# an overwrite, since REPLACE's implicit delete skips triggers.
+_SQL_CREATE_META = "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value) WITHOUT ROWID"
+_COUNT_TRIGGERS = {
+    "dict_count_insert": (
+        "CREATE TRIGGER IF NOT EXISTS dict_count_insert AFTER INSERT ON dict "
+        "BEGIN UPDATE meta SET value = value + 1 WHERE key = 'count'; END"
+    ),
+    "dict_count_delete": (
+        "CREATE TRIGGER IF NOT EXISTS dict_count_delete AFTER DELETE ON dict "
+        "BEGIN UPDATE meta SET value = value - 1 WHERE key = 'count'; END"
+    ),
+}
+_SQL_SELECT_COUNT = "SELECT value FROM meta WHERE key = 'count'"
+_SQL_SELECT_TABLE_DDL = "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'dict'"
+_CACHED_STATEMENTS = 256
+
+# Rows pulled per fetchmany() call when streaming whole-table scans.
+_FETCH_SIZE = 1000
+
+# Values whose encoded form exceeds this many bytes are zlib-compressed when that
+# actually shrinks them; fewer bytes means fewer pages written and cached.
+_COMPRESS_THRESHOLD = 1024
+_COMPRESS_LEVEL = 3
+
+# Exact key types whose encoding _serialize_key memoizes.
+_CACHEABLE_KEY_TYPES = frozenset({str, int, bytes})
+
+# Protocol 5 is the newest one every supported Python (3.8+) can read back.
+_PICKLE_PROTOCOL = 5
+
+# Upper bound on bound parameters per statement; older SQLite builds cap it at 999.
+# A power of two so every padded IN (...) chunk falls on one of a few sizes.
+_MAX_VARIABLES = 512
+
 
 def set_root_path(path: str) -> None:
     """Set the root directory for vault storage.
@@ -40,7 +136,7 @@ def set_root_path(path: str) -> None:
     root_path = path
     vaults_folder = os.path.join(root_path, "vaults")
     os.makedirs(vaults_folder, exist_ok=True)
-    log.info(f"Root path set to: {root_path}, vaults folder: {vaults_folder}")
+    log.info("Root path set to: %s, vaults folder: %s", root_path, vaults_folder)
 
 
 def set_logger(logger: logging.Logger) -> None:
@@ -63,12 +159,21 @@ def set_logger(logger: logging.Logger) -> None:
     log.info("Custom logger configured for vaults module.")
 
 
+# msgpack.packb() builds a new Packer on every call; reusing one per thread is
+# over twice as fast and produces identical bytes.
+_packers = threading.local()
+
+
 def _try_msgpack_serialize(obj: Any) -> Optional[bytes]:
     if not MSGPACK_AVAILABLE:
         return None
     try:
-        return msgpack.packb(obj, use_bin_type=True)
-    except (TypeError, ValueError):
+        packer = _packers.packer
+    except AttributeError:
+        packer = _packers.packer = msgpack.Packer(use_bin_type=True)
+    try:
+        return packer.pack(obj)
+    except (TypeError, ValueError, OverflowError):
         return None
 
 
@@ -76,25 +181,115 @@ def _serialize(obj: Any) -> bytes:
     packed = _try_msgpack_serialize(obj)
     if packed is not None:
         return b'M' + packed
-    return b'P' + pickle.dumps(obj)
+    return b'P' + pickle.dumps(obj, protocol=_PICKLE_PROTOCOL)
+
+
+@lru_cache(maxsize=4096, typed=True)
+def _serialize_cached(key: Any) -> bytes:
+    return _serialize(key)
+
+
+def _serialize_key(key: Any) -> bytes:
+    """Serialize a key for a single-key operation, memoizing common key types.
+
+    Only exact str/int/bytes keys are cached: they are immutable, and typed
+    caching keeps 1, 1.0 and True apart. Bulk paths call _serialize directly
+    so a large batch of distinct keys doesn't churn the cache.
+    """
+    if type(key) in _CACHEABLE_KEY_TYPES:
+        return _serialize_cached(key)
+    return _serialize(key)
+
+
+def _serialize_value(obj: Any) -> bytes:
+    """Serialize a stored value, storing plain str and bytes without a codec.
+
+    Keys always go through _serialize so their bytes stay identical to what
+    older vault files hold; values are never matched byte-for-byte, so they
+    can use the cheaper raw encodings and be compressed when large.
+    """
+    obj_type = type(obj)
+    if obj_type is str:
+        data = b'S' + obj.encode('utf-8')
+    elif obj_type is bytes:
+        data = b'B' + obj
+    else:
+        data = _serialize(obj)
+    if len(data) > _COMPRESS_THRESHOLD:
+        compressed = zlib.compress(data, _COMPRESS_LEVEL)
+        if len(compressed) < len(data):
+            return b'Z' + compressed
+    return data
+
+
+def _unpack_msgpack(payload: bytes) -> Any:
+    if _msgspec_decoder is not None:
+        try:
+            return _msgspec_decoder.decode(payload)
+        except msgspec.DecodeError:
+            pass
+    if not MSGPACK_AVAILABLE:
+        raise RuntimeError("msgpack not available but data is msgpack format")
+    try:
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    except TypeError:
+        # Tuple map keys come back as unhashable lists; rebuild the maps with
+        # tuple keys, which is what msgspec returns for the same bytes.
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False, object_pairs_hook=_dict_with_tuple_keys)
+
+
+def _freeze_key(key: Any) -> Any:
+    if type(key) is list:
+        return tuple(map(_freeze_key, key))
+    return key
+
+
+def _dict_with_tuple_keys(pairs: List[Tuple[Any, Any]]) -> Dict[Any, Any]:
+    return {_freeze_key(key): value for key, value in pairs}
 
 
 def _deserialize(data: bytes) -> Any:
     if not data:
         return None
     marker = data[0:1]
+    if marker == b'Z':
+        return _deserialize(zlib.decompress(data[1:]))
+    if marker == b'S':
+        return data[1:].decode('utf-8')
+    if marker == b'B':
+        return data[1:]
     if marker == b'M':
-        if not MSGPACK_AVAILABLE:
-            raise RuntimeError("msgpack not available but data is msgpack format")
-        result = msgpack.unpackb(data[1:], raw=False)
-    elif marker == b'P':
+        # msgpack already decodes arrays (and so tuples) as lists.
+        return _unpack_msgpack(data[1:])
+    if marker == b'P':
         result = pickle.loads(data[1:])
-    else:
-        raise ValueError(f"Unknown serialization format marker: {marker}")
+        # Pickle keeps tuples; convert to match what msgpack returns.
+        if isinstance(result, tuple):
+            return list(result)
+        return result
+    raise ValueError(f"Unknown serialization format marker: {marker}")
+
+
+def _chunked(items: List[Any], size: int = _MAX_VARIABLES) -> Iterator[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+@lru_cache(maxsize=None)
+def _placeholders(size: int) -> str:
+    return ','.join('?' * size)
+
+
+def _in_params(chunk: List[bytes]) -> Tuple[str, tuple]:
+    """Build the placeholders and parameters for a ``key IN (...)`` clause.
 
-    if isinstance(result, tuple):
-        return list(result)
-    return result
+    The chunk is padded to the next power of two by repeating its last key,
+    so queries of any batch size map onto a handful of distinct SQL strings
+    and keep hitting sqlite3's statement cache. Repeated keys do not change
+    what IN matches.
+    """
+    size = 1 << (len(chunk) - 1).bit_length()
+    return _placeholders(size), tuple(chunk) + (chunk[-1],) * (size - len(chunk))
 
 
 class VaultError(Exception):
@@ -110,7 +305,9 @@ class Vault:
     Args:
         vault_name: Name of the vault (creates `name.db` file).
         to_create: If False, raises VaultError if vault doesn't exist.
-        thread_safe: If True, uses RLock for concurrent access.
+        thread_safe: If True, each thread gets its own connection and writes are
+            serialized with an RLock; reads skip the lock unless cache_size > 0.
+        cache_size: Number of recently read values to keep in memory (0 disables).
 
     Example:
         >>> from vaults import Vault, set_root_path
@@ -120,15 +317,23 @@ class Vault:
         >>> v.get('key')
         'value'
     """
-    __slots__ = {"vault_name", "db_path", "_connection", "_thread_safe", "_lock"}
+    __slots__ = {"vault_name", "db_path", "_main_connection", "_local", "_thread_connections", "_cursor",
+                 "_thread_safe", "_write_lock", "_cache", "_cache_size"}
 
-    def __init__(self, vault_name: str, to_create: bool = True, thread_safe: bool = False) -> None:
+    def __init__(self, vault_name: str, to_create: bool = True, thread_safe: bool = False,
+                 cache_size: int = 0) -> None:
         """Initialize a Vault instance.
 
         Args:
             vault_name: Name of the vault (creates `name.db` file).
             to_create: If False, raises VaultError if vault doesn't exist.
-            thread_safe: If True, uses RLock for concurrent access.
+            thread_safe: If True, every thread gets its own connection so reads
+                run in parallel under WAL; writes are serialized with an RLock.
+                With cache_size > 0, cached reads also hold the lock so a
+                concurrent write can't be cached over.
+            cache_size: Number of recently read values to keep in an in-memory
+                LRU cache. Disabled by default because writes made through
+                other connections are not seen by the cache.
 
         Raises:
             VaultError: If vault doesn't exist and to_create is False.
@@ -137,99 +342,342 @@ class Vault:
         self.vault_name = vault_name
         self.db_path = os.path.join(vaults_folder, f"{vault_name}.db")
         self._thread_safe = thread_safe
-        self._lock = threading.RLock() if thread_safe else None
-
-        path_exists = os.path.exists(self.db_path)
+        self._write_lock = threading.RLock() if thread_safe else None
+        self._cache_size = cache_size
+        self._cache = OrderedDict() if cache_size > 0 else None
+        self._local = None
+        self._thread_connections = None
+        self._cursor = None
+
+        path_exists = self.db_path in _memory_anchors if _IN_MEMORY else os.path.exists(self.db_path)
         if path_exists or to_create:
-            self._connection = sqlite3.connect(self.db_path, check_same_thread=not thread_safe)
-            self._connection.isolation_level = None
+            self._main_connection = self._connect()
+            self._configure_connection(self._main_connection)
         else:
-            log.error(f"No such vault: '{vault_name}'!")
+            log.error("No such vault: '%s'!", vault_name)
             raise VaultError(f"Vault '{vault_name}' does not exist")
 
         if to_create and not path_exists:
-            log.info(f"Creating vault '{vault_name}'!")
+            log.info("Creating vault '%s'!", vault_name)
             self._create_table()
         elif not path_exists and not to_create:
-            log.error(f"No such vault: '{vault_name}'!")
+            log.error("No such vault: '%s'!", vault_name)
             raise VaultError(f"Vault '{vault_name}' does not exist")
 
+        if path_exists:
+            self._ensure_without_rowid()
+        self._ensure_count_tracking()
+
+        # In-memory vaults keep one connection: shared-cache connections use
+        # table-level locks that fail immediately instead of waiting.
+        if thread_safe and not _IN_MEMORY:
+            self._local = threading.local()
+            self._local.connection = self._main_connection
+            self._thread_connections = {threading.current_thread(): self._main_connection}
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        local = self._local
+        if local is None:
+            return self._main_connection
+        try:
+            return local.connection
+        except AttributeError:
+            return self._open_thread_connection()
+
+    def _open_thread_connection(self) -> sqlite3.Connection:
+        log.debug("Opening connection to vault '%s' for thread %s.", self.vault_name, threading.get_ident())
+        connection = self._connect()
+        self._configure_connection(connection)
+        with self._write_lock:
+            if self._thread_connections is None:
+                # close() ran meanwhile; fall back to the closed main connection.
+                connection.close()
+                return self._main_connection
+            for thread in [t for t in self._thread_connections if not t.is_alive()]:
+                self._thread_connections.pop(thread).close()
+            self._thread_connections[threading.current_thread()] = connection
+        self._local.connection = connection
+        return connection
+
+    def _connect(self) -> sqlite3.Connection:
+        if not _IN_MEMORY:
+            return sqlite3.connect(
+                self.db_path, check_same_thread=not self._thread_safe, isolation_level=None,
+                cached_statements=_CACHED_STATEMENTS
+            )
+        uri = f"file:{urllib.parse.quote(self.db_path)}?mode=memory&cache=shared"
+        if self.db_path not in _memory_anchors:
+            _memory_anchors[self.db_path] = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        return sqlite3.connect(
+            uri, uri=True, check_same_thread=not self._thread_safe, isolation_level=None,
+            cached_statements=_CACHED_STATEMENTS
+        )
+
+    def _configure_connection(self, connection: sqlite3.Connection) -> None:
+        if _IN_MEMORY:
+            return
+        log.debug("Applying connection PRAGMAs.")
+        try:
+            for pragma in _CONNECTION_PRAGMAS:
+                connection.execute(pragma)
+        except sqlite3.Error as e:
+            log.error("Failed to configure connection: %s", e)
+            raise VaultError(f"Failed to configure connection: {e}")
+
     def _create_table(self) -> None:
         log.debug("Creating table in the database.")
         try:
-            self._execute("CREATE TABLE IF NOT EXISTS dict (key BLOB PRIMARY KEY, value BLOB)")
+            self._execute(_SQL_CREATE_TABLE)
         except sqlite3.Error as e:
-            log.error(f"Failed to create table: {e}")
+            log.error("Failed to create table: %s", e)
             raise VaultError(f"Failed to create table: {e}")
 
+    def _is_rowid_table(self, cursor: sqlite3.Cursor) -> bool:
+        row = cursor.execute(_SQL_SELECT_TABLE_DDL).fetchone()
+        return row is not None and "WITHOUT ROWID" not in row[0].upper()
+
+    def _ensure_without_rowid(self) -> None:
+        """Rebuild a legacy rowid ``dict`` table as WITHOUT ROWID.
+
+        Older vault files kept rows in a rowid table with a separate primary
+        key index. The copy runs once, in one transaction; dropping the old
+        table also drops its count triggers, which _ensure_count_tracking then
+        reinstalls with a fresh count.
+        """
+        if not self._is_rowid_table(self._connection.cursor()):
+            return
+
+        log.info("Migrating vault '%s' to a WITHOUT ROWID table.", self.vault_name)
+        with self._transaction() as cursor:
+            # Another connection may have migrated it while we waited for the lock.
+            if not self._is_rowid_table(cursor):
+                return
+            cursor.execute("DROP TABLE IF EXISTS dict_new")
+            cursor.execute("CREATE TABLE dict_new (key BLOB PRIMARY KEY, value BLOB) WITHOUT ROWID")
+            # A rowid table's primary key admits NULLs; those rows were unreachable anyway.
+            cursor.execute("INSERT OR REPLACE INTO dict_new (key, value) SELECT key, value FROM dict WHERE key IS NOT NULL")
+            cursor.execute("DROP TABLE dict")
+            cursor.execute("ALTER TABLE dict_new RENAME TO dict")
+        try:
+            self._execute("VACUUM")
+        except VaultError as e:
+            log.warning("Could not vacuum vault '%s' after migration: %s", self.vault_name, e)
+
+    def _ensure_count_tracking(self) -> None:
+        """Install the meta table and row-count triggers if they are missing.
+
+        Vaults created before the triggers existed are seeded with a one-time
+        COUNT(*) inside the same transaction that installs them.
+        """
+        placeholders = ','.join('?' * len(_COUNT_TRIGGERS))
+        cursor = self._execute(
+            f"SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name IN ({placeholders})",
+            tuple(_COUNT_TRIGGERS)
+        )
+        if cursor.fetchone()[0] == len(_COUNT_TRIGGERS):
+            return
+
+        log.debug("Installing row count triggers in vault '%s'.", self.vault_name)
+        with self._transaction() as cursor:
+            cursor.execute(_SQL_CREATE_TABLE)
+            cursor.execute(_SQL_CREATE_META)
+            cursor.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('count', (SELECT COUNT(*) FROM dict))")
+            for trigger_sql in _COUNT_TRIGGERS.values():
+                cursor.execute(trigger_sql)
+
     def _execute(self, query: str, params: tuple = ()) -> sqlite3.Cursor:
         try:
             cursor = self._connection.cursor()
             cursor.execute(query, params)
             return cursor
         except sqlite3.Error as e:
-            log.error(f"Database error: {e}")
+            log.error("Database error: %s", e)
             raise VaultError(f"Database error: {e}")
 
-    def _execute_with_lock(self, query: str, params: tuple = (())[0:0]) -> sqlite3.Cursor:
-        if self._lock:
-            with self._lock:
-                return self._execute(query, params)
-        return self._execute(query, params)
+    def _point_cursor(self) -> sqlite3.Cursor:
+        """Return this thread's reusable cursor for single-row statements."""
+        local = self._local
+        if local is not None:
+            try:
+                return local.cursor
+            except AttributeError:
+                local.cursor = self._connection.cursor()
+                return local.cursor
+        if self._thread_safe:
+            # One connection shared by every thread: a shared cursor would let
+            # concurrent readers overwrite each other's results.
+            return self._connection.cursor()
+        if self._cursor is None:
+            self._cursor = self._connection.cursor()
+        return self._cursor
+
+    def _execute_point(self, query: str, params: tuple = ()) -> sqlite3.Cursor:
+        """Like _execute, but on a reused cursor.
+
+        Only for statements whose result is consumed before the next call on
+        the same thread; scans and bulk lookups use _execute.
+        """
+        try:
+            cursor = self._point_cursor()
+            cursor.execute(query, params)
+            return cursor
+        except sqlite3.Error as e:
+            log.error("Database error: %s", e)
+            raise VaultError(f"Database error: {e}")
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Cursor]:
+        """Run the enclosed statements in one BEGIN IMMEDIATE ... COMMIT block."""
+        with self._write_lock or nullcontext():
+            cursor = self._connection.cursor()
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                yield cursor
+                cursor.execute("COMMIT")
+            except sqlite3.Error as e:
+                if self._connection.in_transaction:
+                    self._connection.rollback()
+                log.error("Transaction failed: %s", e)
+                raise VaultError(f"Transaction failed: {e}")
+            except BaseException:
+                if self._connection.in_transaction:
+                    self._connection.rollback()
+                raise
+
+    def _iter_rows(self, query: str) -> Iterator[tuple]:
+        cursor = self._execute(query)
+        cursor.arraysize = _FETCH_SIZE
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                return
+            yield from rows
+
+    def _execute_with_lock(self, query: str, params: tuple = ()) -> sqlite3.Cursor:
+        """Execute a write statement, holding the write lock only around the SQL call."""
+        if self._write_lock:
+            with self._write_lock:
+                return self._execute_point(query, params)
+        return self._execute_point(query, params)
+
+    def _cache_fetch(self, serialized_key: bytes) -> Optional[bytes]:
+        """Return the stored value bytes for a key, consulting the LRU cache first."""
+        with self._write_lock or nullcontext():
+            data = self._cache.get(serialized_key)
+            if data is not None:
+                self._cache.move_to_end(serialized_key)
+                return data
+            cursor = self._execute_point(_SQL_SELECT_VALUE, (serialized_key,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            self._cache_store(serialized_key, row[0])
+            return row[0]
+
+    def _cache_store(self, serialized_key: bytes, data: bytes) -> None:
+        self._cache[serialized_key] = data
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def _cache_discard(self, serialized_keys: List[bytes]) -> None:
+        if self._cache is None:
+            return
+        with self._write_lock or nullcontext():
+            for serialized_key in serialized_keys:
+                self._cache.pop(serialized_key, None)
+
+    def _cache_clear(self) -> None:
+        if self._cache is None:
+            return
+        with self._write_lock or nullcontext():
+            self._cache.clear()
 
     def _put(self, key: Any, value: Any) -> None:
-        log.debug(f"Putting key: {key} into vault.")
-        serialized_key = _serialize(key)
-        serialized_value = _serialize(value)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Putting key: %s into vault.", key)
+        serialized_key = _serialize_key(key)
+        serialized_value = _serialize_value(value)
         try:
-            self._execute_with_lock(
-                "INSERT OR REPLACE INTO dict (key, value) VALUES (?, ?)",
-                (serialized_key, serialized_value)
-            )
+            self._execute_with_lock(_SQL_UPSERT, (serialized_key, serialized_value))
         except VaultError:
             raise
+        self._cache_discard([serialized_key])
 
     def put(self, key: Any, value: Any) -> None:
         self._put(key, value)
-        log.info(f"Key stored in vault.")
+        log.info("Key stored in vault.")
 
     def _get(self, key: Any) -> Optional[Any]:
-        log.debug(f"Retrieving key: {key} from vault.")
-        serialized_key = _serialize(key)
-        cursor = self._execute("SELECT value FROM dict WHERE key = ?", (serialized_key,))
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Retrieving key: %s from vault.", key)
+        serialized_key = _serialize_key(key)
+        if self._cache is not None:
+            data = self._cache_fetch(serialized_key)
+            return _deserialize(data) if data is not None else None
+        cursor = self._execute_point(_SQL_SELECT_VALUE, (serialized_key,))
         row = cursor.fetchone()
         return _deserialize(row[0]) if row else None
 
     def get(self, key: Any, default: Any = None) -> Any:
         value = self._get(key)
         if value is not None:
-            log.info(f"Retrieved key from vault.")
+            log.info("Retrieved key from vault.")
         else:
-            log.warning(f"Key not found in vault, returning default.")
+            log.warning("Key not found in vault, returning default.")
             value = default
         return value
 
     def _pop(self, key: Any) -> Optional[Any]:
-        log.debug(f"Popping key: {key} from vault.")
-        serialized_key = _serialize(key)
-        cursor = self._execute("SELECT value FROM dict WHERE key = ?", (serialized_key,))
-        row = cursor.fetchone()
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Popping key: %s from vault.", key)
+        serialized_key = _serialize_key(key)
+        # Decoded before COMMIT so a value that can't be decoded (e.g. a pickled
+        # class that no longer exists) rolls the delete back instead of losing it.
+        with self._transaction() as cursor:
+            if _HAS_RETURNING:
+                rows = cursor.execute(_SQL_POP, (serialized_key,)).fetchall()
+                row = rows[0] if rows else None
+            else:
+                row = cursor.execute(_SQL_SELECT_VALUE, (serialized_key,)).fetchone()
+                if row:
+                    cursor.execute(_SQL_DELETE, (serialized_key,))
+            value = _deserialize(row[0]) if row else None
         if row:
-            value = _deserialize(row[0])
-            self._execute("DELETE FROM dict WHERE key = ?", (serialized_key,))
-            log.info(f"Key removed from vault.")
+            self._cache_discard([serialized_key])
+            log.info("Key removed from vault.")
             return value
-        log.warning(f"Key not found for pop operation.")
+        log.warning("Key not found for pop operation.")
         return None
 
     def pop(self, key: Any) -> Optional[Any]:
         value = self._pop(key)
         return value
 
+    def delete(self, key: Any) -> bool:
+        """Remove a key without reading or decoding its value.
+
+        Args:
+            key: Key to remove.
+
+        Returns:
+            True if the key existed and was removed, False otherwise.
+        """
+        serialized_key = _serialize_key(key)
+        deleted = self._execute_with_lock(_SQL_DELETE, (serialized_key,)).rowcount > 0
+        if deleted:
+            self._cache_discard([serialized_key])
+            log.info("Key deleted from vault.")
+        else:
+            log.warning("Key not found for delete operation.")
+        return deleted
+
     def put_many(self, data: Dict[Any, Any]) -> int:
         """Bulk insert or update multiple key-value pairs.
 
-        Uses a single transaction for atomicity and efficiency.
+        Uses a single transaction for atomicity and efficiency. Rows are
+        serialized lazily (``map`` keeps the loop in C) while SQLite consumes
+        them, so the whole batch is never held in memory twice.
 
         Args:
             data: Dictionary of key-value pairs to store.
@@ -241,34 +689,26 @@ class Vault:
             >>> v.put_many({'a': 1, 'b': 2, 'c': 3})
             3
         """
-        log.debug(f"put_many: Bulk inserting {len(data)} items into vault '{self.vault_name}'.")
+        log.debug("put_many: Bulk inserting %s items into vault '%s'.", len(data), self.vault_name)
         if not data:
             log.info("put_many: No data to insert.")
             return 0
 
-        serialized_items = [(_serialize(k), _serialize(v)) for k, v in data.items()]
+        serialized_items = zip(map(_serialize, data.keys()), map(_serialize_value, data.values()))
 
-        if self._lock:
-            with self._lock:
-                cursor = self._connection.cursor()
-                cursor.executemany(
-                    "INSERT OR REPLACE INTO dict (key, value) VALUES (?, ?)",
-                    serialized_items
-                )
-        else:
-            cursor = self._connection.cursor()
-            cursor.executemany(
-                "INSERT OR REPLACE INTO dict (key, value) VALUES (?, ?)",
-                serialized_items
-            )
+        with self._transaction() as cursor:
+            cursor.executemany(_SQL_UPSERT, serialized_items)
+        if self._cache is not None:
+            self._cache_discard([_serialize(k) for k in data])
 
-        log.info(f"put_many: Inserted {len(serialized_items)} items into vault '{self.vault_name}'.")
-        return len(serialized_items)
+        log.info("put_many: Inserted %s items into vault '%s'.", len(data), self.vault_name)
+        return len(data)
 
     def get_many(self, keys: List[Any]) -> Dict[Any, Any]:
         """Bulk fetch multiple values by keys.
 
-        Returns only keys that exist in the vault.
+        Returns only keys that exist in the vault. Keys are looked up in
+        chunks to stay under SQLite's bound-parameter limit.
 
         Args:
             keys: List of keys to retrieve.
@@ -281,27 +721,45 @@ class Vault:
             >>> v.get_many(['a', 'b', 'missing'])
             {'a': 1, 'b': 2}
         """
-        log.debug(f"get_many: Fetching {len(keys)} keys from vault '{self.vault_name}'.")
+        log.debug("get_many: Fetching %s keys from vault '%s'.", len(keys), self.vault_name)
         if not keys:
             log.info("get_many: No keys to fetch.")
             return {}
 
         serialized_keys = [_serialize(k) for k in keys]
-        placeholders = ','.join('?' * len(serialized_keys))
-
-        cursor = self._execute(
-            f"SELECT key, value FROM dict WHERE key IN ({placeholders})",
-            tuple(serialized_keys)
-        )
-
-        result = {(_deserialize(row[0])): _deserialize(row[1]) for row in cursor.fetchall()}
-        log.info(f"get_many: Retrieved {len(result)} items from vault '{self.vault_name}'.")
+        result = {}
+        if self._cache is None:
+            for serialized_key, data in self._select_many(serialized_keys):
+                result[_deserialize(serialized_key)] = _deserialize(data)
+        else:
+            # Held across the SELECT so a concurrent write can't be cached over.
+            with self._write_lock or nullcontext():
+                missing = []
+                for serialized_key in serialized_keys:
+                    data = self._cache.get(serialized_key)
+                    if data is None:
+                        missing.append(serialized_key)
+                    else:
+                        self._cache.move_to_end(serialized_key)
+                        # Keys come back decoded, exactly as on a miss.
+                        result[_deserialize(serialized_key)] = _deserialize(data)
+                for serialized_key, data in self._select_many(missing):
+                    self._cache_store(serialized_key, data)
+                    result[_deserialize(serialized_key)] = _deserialize(data)
+        log.info("get_many: Retrieved %s items from vault '%s'.", len(result), self.vault_name)
         return result
 
+    def _select_many(self, serialized_keys: List[bytes]) -> Iterator[Tuple[bytes, bytes]]:
+        for chunk in _chunked(serialized_keys):
+            placeholders, params = _in_params(chunk)
+            cursor = self._execute(f"SELECT key, value FROM dict WHERE key IN ({placeholders})", params)
+            yield from cursor.fetchall()
+
     def pop_many(self, keys: List[Any]) -> Dict[Any, Any]:
         """Bulk remove and return multiple key-value pairs.
 
-        Logs a warning for keys that don't exist.
+        Lookup and removal run in a single transaction. Logs a warning for
+        keys that don't exist.
 
         Args:
             keys: List of keys to remove.
@@ -314,30 +772,40 @@ class Vault:
             >>> v.pop_many(['a'])
             {'a': 1}
         """
-        log.debug(f"pop_many: Bulk removing {len(keys)} keys from vault '{self.vault_name}'.")
+        log.debug("pop_many: Bulk removing %s keys from vault '%s'.", len(keys), self.vault_name)
         if not keys:
             log.info("pop_many: No keys to remove.")
             return {}
 
-        found = self.get_many(keys)
+        serialized_keys = [_serialize(k) for k in keys]
+        rows = []
+        with self._transaction() as cursor:
+            for chunk in _chunked(serialized_keys):
+                placeholders, params = _in_params(chunk)
+                if _HAS_RETURNING:
+                    cursor.execute(f"DELETE FROM dict WHERE key IN ({placeholders}) RETURNING key, value", params)
+                    rows.extend(cursor.fetchall())
+                else:
+                    cursor.execute(f"SELECT key, value FROM dict WHERE key IN ({placeholders})", params)
+                    rows.extend(cursor.fetchall())
+                    cursor.execute(f"DELETE FROM dict WHERE key IN ({placeholders})", params)
+            # Built before COMMIT: a decode or hashing error rolls the deletes back.
+            found = {_deserialize(row[0]): _deserialize(row[1]) for row in rows}
+        self._cache_discard(serialized_keys)
+
         if not found:
             log.warning("pop_many: No keys found to remove.")
             return {}
 
-        serialized_keys = [_serialize(k) for k in found.keys()]
-        placeholders = ','.join('?' * len(serialized_keys))
-
-        self._execute(
-            f"DELETE FROM dict WHERE key IN ({placeholders})",
-            tuple(serialized_keys)
-        )
-
-        log.info(f"pop_many: Removed {len(found)} items from vault '{self.vault_name}'.")
+        log.info("pop_many: Removed %s items from vault '%s'.", len(found), self.vault_name)
         return found
 
     def has_keys(self, keys: List[Any]) -> bool:
         """Check if all specified keys exist in the vault.
 
+        Uses one COUNT query per chunk of keys and stops at the first chunk
+        with a missing key.
+
         Args:
             keys: List of keys to check.
 
@@ -351,64 +819,166 @@ class Vault:
             >>> v.has_keys(['a', 'c'])
             False
         """
-        log.debug(f"has_keys: Checking {len(keys)} keys in vault '{self.vault_name}'.")
+        log.debug("has_keys: Checking %s keys in vault '%s'.", len(keys), self.vault_name)
         if not keys:
             log.info("has_keys: No keys to check.")
             return True
 
-        serialized_keys = [_serialize(k) for k in keys]
-        placeholders = ','.join('?' * len(serialized_keys))
-
-        cursor = self._execute(
-            f"SELECT COUNT(*) FROM dict WHERE key IN ({placeholders})",
-            tuple(serialized_keys)
-        )
-
-        count = cursor.fetchone()[0]
-        all_present = count == len(keys)
-        log.info(f"has_keys: Checked {len(keys)} keys in vault '{self.vault_name}'. All present: {all_present}.")
+        # Deduplicated so a repeated key can't push the expected count above
+        # the number of matching rows.
+        serialized_keys = list(dict.fromkeys(map(_serialize, keys)))
+        all_present = True
+        for chunk in _chunked(serialized_keys):
+            placeholders, params = _in_params(chunk)
+            cursor = self._execute(f"SELECT COUNT(*) FROM dict WHERE key IN ({placeholders})", params)
+            if cursor.fetchone()[0] != len(chunk):
+                all_present = False
+                break
+        log.info("has_keys: Checked %s keys in vault '%s'. All present: %s.",
+                 len(keys), self.vault_name, all_present)
         return all_present
 
     def popitem(self) -> Tuple[Any, Any]:
-        log.debug(f"Popping arbitrary item from vault.")
-        cursor = self._execute("SELECT key, value FROM dict LIMIT 1")
-        row = cursor.fetchone()
+        log.debug("Popping arbitrary item from vault.")
+        # The fused DELETE ... RETURNING runs inside BEGIN IMMEDIATE and the
+        # item is decoded before COMMIT, so a decode error keeps the row.
+        with self._transaction() as cursor:
+            if _HAS_RETURNING:
+                rows = cursor.execute(_SQL_POPITEM).fetchall()
+                row = rows[0] if rows else None
+            else:
+                row = cursor.execute("SELECT key, value FROM dict LIMIT 1").fetchone()
+                if row:
+                    cursor.execute(_SQL_DELETE, (row[0],))
+            if row:
+                key = _deserialize(row[0])
+                value = _deserialize(row[1])
         if row:
-            key = _deserialize(row[0])
-            value = _deserialize(row[1])
-            self._execute("DELETE FROM dict WHERE key = ?", (row[0],))
-            log.info(f"Popped item from vault.")
+            self._cache_discard([row[0]])
+            log.info("Popped item from vault.")
             return (key, value)
         raise VaultError("popitem(): dictionary is empty")
 
+    def checkpoint(self) -> bool:
+        """Copy the WAL back into the database file and truncate it.
+
+        Useful between large ``put_many`` batches or before an idle period, to
+        keep the ``-wal`` file small. It can only finish when no reads are in
+        progress: another connection with an open read makes it wait up to the
+        5 second busy timeout (holding the write lock) and then give up, and an
+        unfinished ``iter_*`` scan on this vault makes it raise VaultError.
+
+        Returns:
+            True if the WAL was fully checkpointed and truncated, False if
+            readers blocked it.
+        """
+        log.debug("Checkpointing vault '%s'.", self.vault_name)
+        busy, wal_pages, checkpointed = self._execute_with_lock("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        if busy:
+            log.warning("Checkpoint of vault '%s' blocked by readers: %s of %s WAL pages copied.",
+                        self.vault_name, checkpointed, wal_pages)
+            return False
+        return True
+
+    def close(self) -> None:
+        """Close the vault's database connections.
+
+        The connection is opened once in ``__init__`` (once per thread in
+        thread-safe mode) and reused by every operation; closing is safe to
+        call more than once.
+        """
+        log.debug("Closing connection to vault '%s'.", self.vault_name)
+        connections = [self._main_connection]
+        if self._thread_safe:
+            with self._write_lock:
+                if self._thread_connections is not None:
+                    connections.extend(c for c in self._thread_connections.values() if c is not self._main_connection)
+                    self._thread_connections = None
+                    self._local = None
+        for connection in connections:
+            try:
+                # Lets SQLite refresh planner statistics gathered during this session.
+                connection.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+            connection.close()
+        self._cache_clear()
+
     def delete_vault(self) -> None:
-        log.info(f"Deleting vault '{self.vault_name}'.")
-        if self._connection:
-            self._connection.close()
-        if os.path.exists(self.db_path):
+        log.info("Deleting vault '%s'.", self.vault_name)
+        self.close()
+        if _IN_MEMORY:
+            anchor = _memory_anchors.pop(self.db_path, None)
+            if anchor is not None:
+                anchor.close()
+                log.info("Vault '%s' deleted successfully.", self.vault_name)
+            else:
+                log.warning("Vault '%s' does not exist.", self.vault_name)
+        elif os.path.exists(self.db_path):
             os.remove(self.db_path)
-            log.info(f"Vault '{self.vault_name}' deleted successfully.")
+            for suffix in ("-wal", "-shm"):
+                if os.path.exists(self.db_path + suffix):
+                    os.remove(self.db_path + suffix)
+            log.info("Vault '%s' deleted successfully.", self.vault_name)
         else:
-            log.warning(f"Vault '{self.vault_name}' does not exist.")
+            log.warning("Vault '%s' does not exist.", self.vault_name)
 
     def clear(self) -> None:
-        log.debug(f"Clearing all entries from vault '{self.vault_name}'.")
-        self._execute("DELETE FROM dict")
+        """Remove every entry from the vault.
+
+        The row count triggers are dropped for the duration of the delete so
+        SQLite can truncate the table in one step instead of deleting (and
+        firing a trigger for) each row; the count is reset to zero and the
+        triggers restored in the same transaction.
+        """
+        log.debug("Clearing all entries from vault '%s'.", self.vault_name)
+        with self._transaction() as cursor:
+            for trigger_name in _COUNT_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+            cursor.execute("DELETE FROM dict")
+            cursor.execute("UPDATE meta SET value = 0 WHERE key = 'count'")
+            for trigger_sql in _COUNT_TRIGGERS.values():
+                cursor.execute(trigger_sql)
+        self._cache_clear()
 
     def _list_keys(self) -> List[Any]:
-        log.debug(f"Listing all keys in vault '{self.vault_name}'.")
-        cursor = self._execute("SELECT key FROM dict")
-        return [_deserialize(row[0]) for row in cursor.fetchall()]
+        log.debug("Listing all keys in vault '%s'.", self.vault_name)
+        return list(self.iter_keys())
 
     def list_keys(self) -> List[Any]:
         keys = self._list_keys()
-        log.info(f"Listed {len(keys)} keys from vault '{self.vault_name}'.")
+        log.info("Listed %s keys from vault '%s'.", len(keys), self.vault_name)
         return keys
 
+    def iter_keys(self) -> Iterator[Any]:
+        """Lazily iterate over all keys, fetching rows from SQLite in batches."""
+        log.debug("Streaming all keys from vault '%s'.", self.vault_name)
+        for (key,) in self._iter_rows("SELECT key FROM dict"):
+            yield _deserialize(key)
+
+    def iter_items(self) -> Iterator[Tuple[Any, Any]]:
+        """Lazily iterate over all (key, value) pairs.
+
+        Rows are fetched from SQLite in batches, so only one batch of decoded
+        objects is alive at a time regardless of vault size.
+
+        Example:
+            >>> for key, value in v.iter_items():
+            ...     print(key, value)
+        """
+        log.debug("Streaming all items from vault '%s'.", self.vault_name)
+        for row in self._iter_rows("SELECT key, value FROM dict"):
+            yield _deserialize(row[0]), _deserialize(row[1])
+
+    def iter_values(self) -> Iterator[Any]:
+        """Lazily iterate over all values, fetching rows from SQLite in batches."""
+        log.debug("Streaming all values from vault '%s'.", self.vault_name)
+        for row in self._iter_rows("SELECT value FROM dict"):
+            yield _deserialize(row[0])
+
     def get_all_items(self) -> List[Tuple[Any, Any]]:
-        log.debug(f"Fetching all items from vault '{self.vault_name}'.")
-        cursor = self._execute("SELECT key, value FROM dict")
-        return [(_deserialize(row[0]), _deserialize(row[1])) for row in cursor.fetchall()]
+        log.debug("Fetching all items from vault '%s'.", self.vault_name)
+        return list(self.iter_items())
 
     def __getitem__(self, key: Any) -> Any:
         value = self._get(key)
@@ -420,59 +990,56 @@ class Vault:
         self._put(key, value)
 
     def __delitem__(self, key: Any) -> None:
-        serialized_key = _serialize(key)
-        cursor = self._execute("SELECT 1 FROM dict WHERE key = ?", (serialized_key,))
-        if not cursor.fetchone():
+        if not self.delete(key):
             raise KeyError(key)
-        self._execute("DELETE FROM dict WHERE key = ?", (serialized_key,))
-        log.info(f"Key deleted from vault.")
 
     def __contains__(self, key: Any) -> bool:
-        serialized_key = _serialize(key)
-        cursor = self._execute("SELECT 1 FROM dict WHERE key = ? LIMIT 1", (serialized_key,))
-        return cursor.fetchone() is not None
+        serialized_key = _serialize_key(key)
+        cursor = self._execute_point(_SQL_EXISTS, (serialized_key,))
+        return bool(cursor.fetchone()[0])
 
     def __len__(self) -> int:
-        cursor = self._execute("SELECT COUNT(*) FROM dict")
+        cursor = self._execute_point(_SQL_SELECT_COUNT)
         return cursor.fetchone()[0]
 
     def __iter__(self) -> Iterator[Any]:
+        # A snapshot, so the loop body may write to the vault; iter_keys()
+        # streams instead but must not be mixed with writes.
         return iter(self._list_keys())
 
     def __bool__(self) -> bool:
-        cursor = self._execute("SELECT 1 FROM dict LIMIT 1")
+        cursor = self._execute_point("SELECT 1 FROM dict LIMIT 1")
         return cursor.fetchone() is not None
 
     def __repr__(self) -> str:
-        items = list(self.get_all_items())
-        return f"Vault('{self.vault_name}', {len(items)} items)"
+        return f"Vault('{self.vault_name}', {len(self)} items)"
 
     def keys(self) -> List[Any]:
         return self._list_keys()
 
     def values(self) -> List[Any]:
-        log.debug(f"Fetching all values from vault '{self.vault_name}'.")
-        cursor = self._execute("SELECT value FROM dict")
-        return [_deserialize(row[0]) for row in cursor.fetchall()]
+        log.debug("Fetching all values from vault '%s'.", self.vault_name)
+        return list(self.iter_values())
 
     def items(self) -> List[Tuple[Any, Any]]:
         return self.get_all_items()
 
     def update(self, other: Dict[Any, Any]) -> None:
-        for key, value in other.items():
-            self._put(key, value)
+        self.put_many(other)
 
     def setdefault(self, key: Any, default: Any = None) -> Any:
-        serialized_key = _serialize(key)
-        cursor = self._execute("SELECT value FROM dict WHERE key = ?", (serialized_key,))
-        row = cursor.fetchone()
+        serialized_key = _serialize_key(key)
+        with self._write_lock or nullcontext():
+            cursor = self._execute_point(_SQL_SELECT_VALUE, (serialized_key,))
+            row = cursor.fetchone()
+            if not row:
+                self._put(key, default)
         if row:
             return _deserialize(row[0])
-        self._put(key, default)
         return default
 
     def __enter__(self) -> "Vault":
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
-        self._connection.commit()
+        self.close()